@@ -1,3 +1,6 @@
 from .game_state import GameState
 from .move import Move
 from .smart_move_finder import SmartMoveFinder
+from .game import Game
+from .game_archive import GameArchiveReader, GameArchiveWriter
+from .pgn import read_pgn, write_pgn
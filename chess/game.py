@@ -0,0 +1,42 @@
+from typing import Iterable
+
+from .game_state import GameState
+from .move import Move
+
+
+class Game:
+    # a finished (or in progress) game: PGN tag pairs plus the replayed state
+    SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+    def __init__(
+        self, headers: dict[str, str] | None = None, game_state: GameState | None = None
+    ):
+        self.headers = dict(headers) if headers else {}
+        self.game_state = game_state if game_state is not None else GameState()
+
+    @property
+    def moves(self) -> list[Move]:
+        return self.game_state.move_log
+
+    @property
+    def result(self) -> str:
+        return self.headers.get("Result", "*")
+
+    @classmethod
+    def from_squares(
+        cls,
+        squares: Iterable[tuple[tuple[int, int], tuple[int, int]]],
+        headers: dict[str, str] | None = None,
+    ) -> "Game":
+        # replays (start_sq, end_sq) pairs without generating the valid moves,
+        # only checking that the side to move has a piece on the start square
+        gs = GameState()
+        for start_sq, end_sq in squares:
+            piece = gs.board[start_sq[0]][start_sq[1]]
+            if piece == GameState.BLANK or (piece[0] == "w") != gs.white_to_move:
+                square = (
+                    Move.cols_to_files[start_sq[1]] + Move.rows_to_ranks[start_sq[0]]
+                )
+                raise ValueError(f"No piece of the side to move on {square}")
+            gs.make_move(gs.get_move(start_sq, end_sq))
+        return cls(headers, gs)
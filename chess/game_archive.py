@@ -0,0 +1,149 @@
+import struct
+from typing import BinaryIO, Iterator
+
+import numpy as np
+
+from .game import Game
+from .move import Move
+
+# file layout (all integers little-endian):
+#   magic (4s) version (B) padding (3x)
+#   one record per game:
+#       headers length (H) move count (H)
+#       headers as utf-8 "key\0value\0" pairs
+#       moves, 2 bytes each: start square << 6 | end square (square = row * 8 + col)
+#   index: byte offset of every record (Q each)
+#   trailer: index offset (Q) game count (Q) magic (4s)
+MAGIC = b"PCGA"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB3x")
+RECORD_HEADER = struct.Struct("<HH")
+TRAILER = struct.Struct("<QQ4s")
+MOVE_DTYPE = np.dtype("<u2")
+OFFSET_DTYPE = np.dtype("<u8")
+
+
+def encode_move(move: Move) -> int:
+    start = move.start_sq[0] * 8 + move.start_sq[1]
+    end = move.end_sq[0] * 8 + move.end_sq[1]
+    return start << 6 | end
+
+
+def decode_move(code: int) -> tuple[tuple[int, int], tuple[int, int]]:
+    start, end = code >> 6, code & 0x3F
+    return (start // 8, start % 8), (end // 8, end % 8)
+
+
+def read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Game archive is truncated")
+    return data
+
+
+class GameArchiveWriter:
+    def __init__(self, stream: BinaryIO):
+        # the stream is only ever appended to, so it can be a pipe, which must be
+        # at offset 0 as record offsets are absolute positions in the file
+        self.stream = stream
+        self.offsets = []
+        self.closed = False
+        self.position = self.stream.tell() if self.stream.seekable() else 0
+        self.position += self.stream.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def __enter__(self) -> "GameArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, game: Game) -> None:
+        if self.closed:
+            raise ValueError("Cannot write to a closed game archive")
+        # headers are NUL separated, so NUL can't be part of a key or a value
+        if any("\0" in key or "\0" in value for key, value in game.headers.items()):
+            raise ValueError("Game headers can't contain NUL characters")
+        headers = "".join(
+            f"{key}\0{value}\0" for key, value in game.headers.items()
+        ).encode("utf-8")
+        moves = np.fromiter(
+            (encode_move(move) for move in game.moves), dtype=MOVE_DTYPE
+        )
+        if len(headers) > 0xFFFF or len(moves) > 0xFFFF:
+            raise ValueError("Game is too large for the archive format")
+
+        self.offsets.append(self.position)
+        self.position += self.stream.write(RECORD_HEADER.pack(len(headers), len(moves)))
+        self.position += self.stream.write(headers)
+        self.position += self.stream.write(moves.tobytes())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        index_offset = self.position
+        self.stream.write(np.asarray(self.offsets, dtype=OFFSET_DTYPE).tobytes())
+        self.stream.write(TRAILER.pack(index_offset, len(self.offsets), MAGIC))
+        self.stream.flush()
+
+
+class GameArchiveReader:
+    def __init__(self, stream: BinaryIO):
+        # the stream must be seekable, only the index is loaded up front
+        self.stream = stream
+        size = self.stream.seek(0, 2)
+        if size < FILE_HEADER.size + TRAILER.size:
+            raise ValueError("Game archive is truncated")
+        self.stream.seek(0)
+        magic, version = FILE_HEADER.unpack(read_exact(self.stream, FILE_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("Not a game archive")
+        if version != VERSION:
+            raise ValueError(f"Unsupported game archive version: {version}")
+
+        self.stream.seek(size - TRAILER.size)
+        index_offset, count, magic = TRAILER.unpack(
+            read_exact(self.stream, TRAILER.size)
+        )
+        if magic != MAGIC:
+            raise ValueError("Game archive is truncated, missing index")
+        index_size = count * OFFSET_DTYPE.itemsize
+        if (
+            index_offset < FILE_HEADER.size
+            or index_offset + index_size > size - TRAILER.size
+        ):
+            raise ValueError("Game archive is truncated, index out of bounds")
+        self.stream.seek(index_offset)
+        self.offsets = np.frombuffer(
+            read_exact(self.stream, index_size), dtype=OFFSET_DTYPE
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, n: int) -> Game:
+        # Game.from_squares rejects moves from a square the side to move doesn't own
+        headers, codes = self.read_record(n)
+        return Game.from_squares(map(decode_move, codes.tolist()), headers)
+
+    def __iter__(self) -> Iterator[Game]:
+        for n in range(len(self)):
+            yield self[n]
+
+    def read_record(self, n: int) -> tuple[dict[str, str], np.ndarray]:
+        # raw headers and move codes, without replaying the game on a board
+        self.stream.seek(int(self.offsets[n]))
+        headers_length, move_count = RECORD_HEADER.unpack(
+            read_exact(self.stream, RECORD_HEADER.size)
+        )
+        fields = (
+            read_exact(self.stream, headers_length).decode("utf-8").split("\0")[:-1]
+        )
+        headers = dict(zip(fields[::2], fields[1::2]))
+        codes = np.frombuffer(
+            read_exact(self.stream, move_count * MOVE_DTYPE.itemsize), dtype=MOVE_DTYPE
+        )
+        # two 6 bit squares, anything above 12 bits is not a move
+        if codes.size and codes.max() > 0xFFF:
+            raise ValueError("Game archive is corrupt, invalid move code")
+        return headers, codes
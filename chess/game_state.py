@@ -119,6 +119,24 @@ class GameState:
             logger.warning("No moves to undo")
 
     def all_valid_moves(self) -> set[Move]:
+        moves = self.legal_moves()
+
+        if len(moves) == 0:
+            if self.in_check():
+                logger.warning(
+                    "Checkmate!! "
+                    + ("black" if self.white_to_move else "white")
+                    + " wins!"
+                )
+                self.checkmate = True
+            else:
+                self.stalemate = True
+                logger.warning("Stalemate!! It's a draw!")
+
+        return moves
+
+    def legal_moves(self) -> set[Move]:
+        # same as all_valid_moves, without flagging or logging the end of the game
         # generate all possible moves
         moves = self.all_possible_moves()
         # now generate castle move, if the king is not actively under attack
@@ -148,18 +166,6 @@ class GameState:
             self.white_to_move = not self.white_to_move
             self.undo_move()
 
-        if len(moves) == 0:
-            if self.in_check():
-                logger.warning(
-                    "Checkmate!! "
-                    + ("black" if self.white_to_move else "white")
-                    + " wins!"
-                )
-                self.checkmate = True
-            else:
-                self.stalemate = True
-                logger.warning("Stalemate!! It's a draw!")
-
         return moves
 
     def in_check(self) -> bool:
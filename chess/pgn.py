@@ -0,0 +1,227 @@
+import logging
+import re
+from typing import Iterable, Iterator, TextIO
+
+from .game import Game
+from .game_state import GameState
+from .move import Move
+
+logger = logging.getLogger(__name__)
+
+TAG_RE = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*$')
+SAN_RE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+# comments, variations and NAGs carry no moves of the main line
+COMMENT_RE = re.compile(r"\{[^}]*\}|;[^\n]*")
+NAG_RE = re.compile(r"\$\d+")
+MOVE_NUMBER_RE = re.compile(r"^\d+\.+")
+SCAN_RE = re.compile(r"[{};()]|[^\s{};()]+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+ON_ERROR_MODES = ("raise", "skip")
+LINE_WIDTH = 80
+
+
+def parse_san(gs: GameState, san: str) -> Move:
+    token = san.rstrip("+#!?")
+    valid_moves = gs.legal_moves()
+
+    if token.replace("0", "O") in ("O-O", "O-O-O"):
+        end_col = 6 if token.count("-") == 1 else 2
+        candidates = [
+            move
+            for move in valid_moves
+            if move.piece_moved[1] == "K"
+            and move.start_sq[1] == 4
+            and move.end_sq[1] == end_col
+        ]
+    else:
+        match = SAN_RE.match(token)
+        if match is None:
+            raise ValueError(f"Malformed SAN move: {san}")
+        piece, from_file, from_rank, dest, promotion = match.groups()
+        if promotion is not None and promotion != "Q":
+            # GameState.make_move always promotes to a queen
+            raise ValueError(f"Unsupported under-promotion: {san}")
+        end_sq = (Move.ranks_to_rows[dest[1]], Move.files_to_cols[dest[0]])
+        candidates = [
+            move
+            for move in valid_moves
+            if move.piece_moved[1] == (piece or "P")
+            and move.end_sq == end_sq
+            and (from_file is None or move.start_sq[1] == Move.files_to_cols[from_file])
+            and (from_rank is None or move.start_sq[0] == Move.ranks_to_rows[from_rank])
+        ]
+
+    if len(candidates) != 1:
+        reason = "Illegal" if not candidates else "Ambiguous"
+        raise ValueError(f"{reason} SAN move: {san}")
+    return candidates[0]
+
+
+def move_to_san(move: Move, valid_moves: set[Move]) -> str:
+    # SAN without the check/mate suffix, valid_moves are those of the position
+    # the move is played from
+    piece = move.piece_moved[1]
+
+    if piece == "K" and abs(move.start_sq[1] - move.end_sq[1]) == 2:
+        return "O-O" if move.end_sq[1] == 6 else "O-O-O"
+
+    dest = move.get_rank_file(move.end_sq[0], move.end_sq[1])
+    is_capture = move.piece_captured != GameState.BLANK
+    if piece == "P":
+        san = (move.cols_to_files[move.start_sq[1]] + "x" if is_capture else "") + dest
+        if move.is_pawn_promotion():
+            san += "=Q"
+        return san
+
+    rivals = [
+        other
+        for other in valid_moves
+        if other.piece_moved == move.piece_moved
+        and other.end_sq == move.end_sq
+        and other.start_sq != move.start_sq
+    ]
+    disambiguation = ""
+    if rivals:
+        if all(other.start_sq[1] != move.start_sq[1] for other in rivals):
+            disambiguation = move.cols_to_files[move.start_sq[1]]
+        elif all(other.start_sq[0] != move.start_sq[0] for other in rivals):
+            disambiguation = move.rows_to_ranks[move.start_sq[0]]
+        else:
+            disambiguation = move.get_rank_file(*move.start_sq)
+    return piece + disambiguation + ("x" if is_capture else "") + dest
+
+
+def read_pgn(stream: TextIO, on_error: str = "raise") -> Iterator[Game]:
+    # yields one game at a time so only a single game is ever held in memory,
+    # with on_error="skip" a game that fails to parse is logged and dropped
+    if on_error not in ON_ERROR_MODES:
+        raise ValueError(f"Unknown on_error mode: {on_error}")
+
+    for number, (headers, movetext) in enumerate(split_games(stream), start=1):
+        try:
+            game = parse_game(headers, movetext)
+        except ValueError as error:
+            if on_error == "raise":
+                raise
+            logger.warning(
+                f"Skipping game {number} "
+                f"({headers.get('White', '?')} vs {headers.get('Black', '?')}): {error}"
+            )
+            continue
+        yield game
+
+
+def split_games(stream: TextIO) -> Iterator[tuple[dict[str, str], str]]:
+    # a game ends at the next tag section or at a result token of the main line
+    headers = {}
+    movetext = []
+    in_comment, depth = False, 0
+    for line in stream:
+        # exported files often start with a UTF-8 BOM, unless opened with utf-8-sig
+        line = line.strip().lstrip("\ufeff")
+        tag = None if in_comment or depth else TAG_RE.match(line)
+        if tag is not None:
+            if movetext:
+                yield headers, "\n".join(movetext)
+                headers, movetext = {}, []
+            headers[tag.group(1)] = unescape_tag(tag.group(2))
+        elif line and not (line.startswith("%") and not in_comment):
+            movetext.append(line)
+            in_comment, depth, ended = scan_movetext(line, in_comment, depth)
+            if ended:
+                yield headers, "\n".join(movetext)
+                headers, movetext = {}, []
+                in_comment, depth = False, 0
+    if headers or movetext:
+        yield headers, "\n".join(movetext)
+
+
+def scan_movetext(line: str, in_comment: bool, depth: int) -> tuple[bool, int, bool]:
+    # carries the comment/variation state across lines, reports a main line result
+    ended = False
+    for token in SCAN_RE.findall(line):
+        if in_comment:
+            in_comment = token != "}"
+        elif token == "{":
+            in_comment = True
+        elif token == ";":
+            break
+        elif token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token in RESULTS:
+            ended = True
+    return in_comment, depth, ended
+
+
+def parse_game(headers: dict[str, str], movetext: str) -> Game:
+    game = Game(headers)
+    gs = game.game_state
+    for token in tokenize_movetext(movetext):
+        if token in RESULTS:
+            game.headers.setdefault("Result", token)
+            break
+        gs.make_move(parse_san(gs, token))
+    return game
+
+
+def tokenize_movetext(movetext: str) -> Iterator[str]:
+    movetext = NAG_RE.sub(" ", COMMENT_RE.sub(" ", movetext))
+    depth = 0
+    for token in movetext.replace("(", " ( ").replace(")", " ) ").split():
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            token = MOVE_NUMBER_RE.sub("", token)
+            if token:
+                yield token
+
+
+def write_pgn(games: Iterable[Game], stream: TextIO) -> None:
+    for game in games:
+        stream.write(game_to_pgn(game))
+        stream.write("\n")
+
+
+def game_to_pgn(game: Game) -> str:
+    headers = {tag: "?" for tag in Game.SEVEN_TAG_ROSTER}
+    headers["Result"] = "*"
+    headers.update(game.headers)
+    lines = [f'[{tag} "{escape_tag(value)}"]' for tag, value in headers.items()]
+    lines.append("")
+
+    tokens = []
+    gs = GameState()
+    # legal moves after one move are the ones the next move is disambiguated against
+    valid_moves = gs.legal_moves()
+    for i, move in enumerate(game.moves):
+        if i % 2 == 0:
+            tokens.append(f"{i // 2 + 1}.")
+        san = move_to_san(move, valid_moves)
+        gs.make_move(move)
+        valid_moves = gs.legal_moves()
+        if gs.in_check():
+            san += "+" if valid_moves else "#"
+        tokens.append(san)
+    tokens.append(headers["Result"])
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def escape_tag(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def unescape_tag(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
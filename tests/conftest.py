@@ -0,0 +1,14 @@
+from typing import Callable
+
+import pytest
+
+from chess import Game
+
+
+@pytest.fixture
+def move_ids() -> Callable[[Game], list[int]]:
+    # compares games by their moves, Move objects are bound to their own board
+    def ids(game: Game) -> list[int]:
+        return [move.move_id for move in game.moves]
+
+    return ids
@@ -0,0 +1,132 @@
+import io
+import struct
+
+import pytest
+
+from chess import Game, GameArchiveReader, GameArchiveWriter, read_pgn
+
+PGN = """[Event "Castles"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. O-O Nf6 *
+
+[Event "En passant"]
+[Result "*"]
+
+1. e4 a6 2. e5 d5 3. exd6 *
+
+[Event "Promotion"]
+[Result "*"]
+
+1. h4 g5 2. hxg5 h6 3. gxh6 Nc6 4. h7 Nb8 5. hxg8=Q *
+
+[Event "Mate"]
+[Result "0-1"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+"""
+
+
+@pytest.fixture
+def games() -> list[Game]:
+    return list(read_pgn(io.StringIO(PGN)))
+
+
+@pytest.fixture
+def archive(games) -> bytes:
+    stream = io.BytesIO()
+    with GameArchiveWriter(stream) as writer:
+        for game in games:
+            writer.write(game)
+    return stream.getvalue()
+
+
+def test_round_trip(games, archive, move_ids):
+    reader = GameArchiveReader(io.BytesIO(archive))
+    assert len(reader) == len(games)
+    for game, loaded in zip(games, reader):
+        assert loaded.headers == game.headers
+        assert move_ids(loaded) == move_ids(game)
+        assert (loaded.game_state.board == game.game_state.board).all()
+
+
+def test_random_access(games, archive, move_ids):
+    reader = GameArchiveReader(io.BytesIO(archive))
+    assert reader[2].headers["Event"] == "Promotion"
+    assert reader[-1].headers["Event"] == "Mate"
+    assert move_ids(reader[1]) == move_ids(games[1])
+    with pytest.raises(IndexError):
+        reader[len(games)]
+
+
+def test_two_bytes_per_move(games, archive):
+    headers, codes = GameArchiveReader(io.BytesIO(archive)).read_record(0)
+    assert headers == games[0].headers
+    assert codes.nbytes == 2 * len(games[0].moves)
+
+
+def test_empty_archive():
+    stream = io.BytesIO()
+    GameArchiveWriter(stream).close()
+    assert list(GameArchiveReader(stream)) == []
+
+
+@pytest.mark.parametrize("cut", [0, 5, 20, -1, -30])
+def test_truncated_archive(archive, cut):
+    with pytest.raises(ValueError, match="truncated"):
+        GameArchiveReader(io.BytesIO(archive[:cut]))
+
+
+def test_not_an_archive():
+    with pytest.raises(ValueError, match="Not a game archive"):
+        GameArchiveReader(io.BytesIO(b"x" * 64))
+
+
+def test_close_twice_and_write_after_close(games):
+    stream = io.BytesIO()
+    with GameArchiveWriter(stream) as writer:
+        writer.write(games[0])
+        writer.close()
+        size = len(stream.getvalue())
+        with pytest.raises(ValueError):
+            writer.write(games[1])
+    assert len(stream.getvalue()) == size
+    assert len(GameArchiveReader(stream)) == 1
+
+
+def test_nul_in_headers_is_rejected():
+    writer = GameArchiveWriter(io.BytesIO())
+    with pytest.raises(ValueError, match="NUL"):
+        writer.write(Game({"Event": "x\0y"}))
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        0xFFFF,
+        # e6 to e4, nothing stands on e6 in the opening position
+        (2 * 8 + 4) << 6 | (4 * 8 + 4),
+        # e7 to e5, a black pawn with white to move
+        (1 * 8 + 4) << 6 | (3 * 8 + 4),
+    ],
+)
+def test_corrupt_move_code(games, code):
+    stream = io.BytesIO()
+    with GameArchiveWriter(stream) as writer:
+        writer.write(games[1])
+    # the first move of the record is 1. e4, e2 to e4
+    e4 = struct.pack("<H", (6 * 8 + 4) << 6 | (4 * 8 + 4))
+    data = stream.getvalue().replace(e4, struct.pack("<H", code), 1)
+    with pytest.raises(ValueError):
+        GameArchiveReader(io.BytesIO(data))[0]
+
+
+def test_append_to_existing_file(games, archive, tmp_path, move_ids):
+    path = tmp_path / "games.pcga"
+    path.write_bytes(archive)
+    with open(path, "ab") as stream, GameArchiveWriter(stream) as writer:
+        writer.write(games[3])
+    with open(path, "rb") as stream:
+        reader = GameArchiveReader(stream)
+        assert len(reader) == 1
+        assert move_ids(reader[0]) == move_ids(games[3])
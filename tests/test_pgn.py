@@ -0,0 +1,135 @@
+import io
+
+import pytest
+
+from chess import Game, GameState, read_pgn, write_pgn
+from chess.pgn import game_to_pgn, parse_san
+
+
+def play(movetext: str) -> Game:
+    (game,) = read_pgn(io.StringIO(movetext))
+    return game
+
+
+def sans(game: Game) -> list[str]:
+    # SAN tokens of the movetext written back by game_to_pgn
+    movetext = game_to_pgn(game).split("\n\n", 1)[1]
+    return [token for token in movetext.split() if not token[0].isdigit()][:-1]
+
+
+def test_parse_san_pawn_and_piece_moves():
+    gs = GameState()
+    assert str(parse_san(gs, "e4")) == "e2e4"
+    assert str(parse_san(gs, "Nf3")) == "g1f3"
+
+
+@pytest.mark.parametrize("san", ["Nf9", "e5", "Ke2", "hello"])
+def test_parse_san_rejects_illegal_or_malformed(san):
+    with pytest.raises(ValueError):
+        parse_san(GameState(), san)
+
+
+@pytest.mark.parametrize(
+    "movetext",
+    [
+        # castling on both sides
+        "1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. O-O Nf6 *",
+        "1. d4 d5 2. Nc3 Nc6 3. Bf4 Bf5 4. Qd2 Qd7 5. O-O-O O-O-O *",
+        # en passant
+        "1. e4 a6 2. e5 d5 3. exd6 *",
+        # promotion with capture
+        "1. h4 g5 2. hxg5 h6 3. gxh6 Nc6 4. h7 Nb8 5. hxg8=Q *",
+        # file and rank disambiguation
+        "1. d4 d5 2. Nf3 Nf6 3. Nbd2 Nbd7 *",
+        "1. Nc3 a6 2. Ne4 a5 3. Ng5 b6 4. N1f3 *",
+        # check and mate
+        "1. e4 e5 2. Qh5 Nc6 3. Qxf7+ *",
+        "1. f3 e5 2. g4 Qh4# 0-1",
+    ],
+)
+def test_round_trip(movetext, move_ids):
+    game = play(movetext)
+    tokens = [token for token in movetext.split() if not token[0].isdigit()]
+    assert sans(game) == tokens[:-1]
+    assert move_ids(play(game_to_pgn(game))) == move_ids(game)
+
+
+def test_special_moves_update_the_board():
+    castled = play("1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. O-O *").game_state
+    assert castled.board[7][5] == "wR" and castled.board[7][6] == "wK"
+    en_passant = play("1. e4 a6 2. e5 d5 3. exd6 *").game_state
+    assert en_passant.board[3][3] == GameState.BLANK
+    promoted = play("1. h4 g5 2. hxg5 h6 3. gxh6 Nc6 4. h7 Nb8 5. hxg8=Q *")
+    assert promoted.game_state.board[0][6] == "wQ"
+
+
+def test_under_promotion_is_rejected():
+    with pytest.raises(ValueError, match="under-promotion"):
+        play("1. h4 g5 2. hxg5 h6 3. gxh6 Nc6 4. h7 Nb8 5. hxg8=N *")
+
+
+def test_comments_variations_and_nags_are_skipped():
+    game = play(
+        '[Event "Test"]\n'
+        '[White "A \\"quoted\\" name"]\n'
+        "\n"
+        "1. e4 {best by test} e5 $1 2. Nf3 (2. Bc4 Nf6 (2... Bc5)) Nc6 ; main line 1-0\n"
+        "3. Bb5 {a multi line\n"
+        "comment 0-1} a6 1/2-1/2\n"
+    )
+    assert [str(move) for move in game.moves] == [
+        "e2e4",
+        "e7e5",
+        "g1f3",
+        "b8c6",
+        "f1b5",
+        "a7a6",
+    ]
+    assert game.headers["White"] == 'A "quoted" name'
+    assert game.result == "1/2-1/2"
+
+
+def test_games_without_headers_split_on_result():
+    games = list(read_pgn(io.StringIO("1. e4 e5 1-0\n1. d4 d5 2. c4 0-1\n")))
+    assert [len(game.moves) for game in games] == [2, 3]
+    assert [game.result for game in games] == ["1-0", "0-1"]
+
+
+def test_write_pgn_round_trip(move_ids):
+    games = list(
+        read_pgn(
+            io.StringIO(
+                '[Event "One"]\n[Result "1-0"]\n\n1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0\n\n'
+                '[Event "Two"]\n\n1. d4 d5 *\n'
+            )
+        )
+    )
+    stream = io.StringIO()
+    write_pgn(games, stream)
+    again = list(read_pgn(io.StringIO(stream.getvalue())))
+    assert [move_ids(game) for game in again] == [move_ids(game) for game in games]
+    assert [game.headers["Event"] for game in again] == ["One", "Two"]
+    assert "4. Qxf7# 1-0" in stream.getvalue()
+
+
+def test_leading_byte_order_mark():
+    game = play('\ufeff[Event "Exported"]\n\n1. e4 e5 *\n')
+    assert game.headers["Event"] == "Exported"
+    assert len(game.moves) == 2
+
+
+def test_bad_game_raises_by_default():
+    with pytest.raises(ValueError, match="Nf9"):
+        list(read_pgn(io.StringIO("1. Nf9 *\n\n1. e4 *\n")))
+
+
+def test_bad_game_is_skipped_and_logged(caplog):
+    pgn = '[White "Typo"]\n\n1. Nf9 *\n\n[White "Fine"]\n\n1. e4 *\n'
+    games = list(read_pgn(io.StringIO(pgn), on_error="skip"))
+    assert [game.headers["White"] for game in games] == ["Fine"]
+    assert "Skipping game 1" in caplog.text
+
+
+def test_unknown_on_error_mode():
+    with pytest.raises(ValueError):
+        list(read_pgn(io.StringIO(""), on_error="ignore"))